@@ -1,72 +1,51 @@
 import pandas as pd
 import matplotlib.pyplot as plt
+from SwabDates import align_to_2020, parse_collection_dates
 
 # Load the dataset
 file_path = "SwabData_SFE_total_copynumb_region.csv"
-df = pd.read_csv(file_path)
+df = pd.read_csv(file_path, usecols=['collection_date', 'CT', 'type'], dtype={'type': 'category'})
 
 # Convert 'collection_date' to datetime and 'CT' to numeric
-df['collection_date'] = pd.to_datetime(df['collection_date'], errors='coerce')
+df['collection_date'] = parse_collection_dates(df['collection_date'])
 df['CT'] = pd.to_numeric(df['CT'], errors='coerce')
 
-# filter for sample type 's'
-s_samples = df[df['type'] == "S"].copy()
+# filter for sample type 's' and sort once by date - undated rows can't be placed in a year
+s_samples = df[df['type'] == "S"].dropna(subset=['collection_date']).sort_values('collection_date')
 
 # Filter for positive infections (CT > 0)
 s_samples['is_positive'] = s_samples['CT'] > 0
 
 # Extract year and normalize dates to the same reference year (e.g., 2020)
-s_samples['year'] = s_samples['collection_date'].dt.year
+s_samples['year'] = s_samples['collection_date'].dt.year.astype('int16')
 
 # get total number of tests per year
-total_2019 = len(s_samples[s_samples['year'] == 2019])
-total_2020 = len(s_samples[s_samples['year'] == 2020])
+totals = s_samples['year'].value_counts()
+total_2019 = totals.get(2019, 0)
+total_2020 = totals.get(2020, 0)
 total_tests = {2019: total_2019, 2020: total_2020, 2021: 1}
 
 print(total_2019)
 print(total_2020)
 
 s_samples['month_day'] = s_samples['collection_date'].dt.strftime('%m-%d')
-s_samples['aligned_date'] = s_samples['collection_date'].apply(lambda d: d.replace(year=2020))
+s_samples['aligned_date'] = align_to_2020(s_samples['collection_date'])
 
-# sort data within each year
-s_samples = s_samples.sort_values('collection_date')
+# count positives per date, then run a cumulative sum within each year
+daily = s_samples.groupby(['year', 'collection_date'], sort=True)['is_positive'].sum()
+cumulative_pos = daily.groupby(level='year').cumsum()
 
-# calculate running counts by year
-results = []
-
-# process each year separately
-for year in sorted(s_samples['year'].unique()):
-    year_data = s_samples[s_samples['year'] == year].copy()
-
-    # calculate cumulative counts for this year
-    cumulative_total = total_tests[year]
-    cumulative_pos = 0
-
-    for date in sorted(year_data['collection_date'].unique()):
-        date_data = year_data[year_data['collection_date'] == date]
-
-        # add to running totals
-        date_count = len(date_data)
-        date_pos = date_data['is_positive'].sum()
-
-        cumulative_pos += date_pos
-
-        # calculate proportion
-        proportion = cumulative_pos / cumulative_total if cumulative_total > 0 else 0
-
-        # store result
-        results.append({
-            'year': year,
-            'date': date,
-            'aligned_date': pd.to_datetime(date).replace(year=2020),
-            'cumulative_total': cumulative_total,
-            'cumulative_positive': cumulative_pos,
-            'proportion_infected': proportion
-        })
+# total tests for the year each date belongs to
+cumulative_total = daily.index.get_level_values('year').map(total_tests)
 
 # convert to DF
-result_df = pd.DataFrame(results)
+result_df = cumulative_pos.reset_index().rename(
+    columns={'collection_date': 'date', 'is_positive': 'cumulative_positive'})
+result_df['cumulative_total'] = cumulative_total.values
+result_df['proportion_infected'] = cumulative_pos.values / cumulative_total.values
+
+# align dates to the same reference year (2020)
+result_df['aligned_date'] = align_to_2020(result_df['date'])
 
 # remove 2021
 result_df = result_df[result_df['year'] != 2021]
@@ -74,11 +53,10 @@ result_df = result_df[result_df['year'] != 2021]
 # plot running proportion by year
 plt.figure(figsize=(12, 6))
 
-years = sorted(result_df['year'].unique())
 colors = ['#FB0650', '#1E88E5']
 
-for i, year in enumerate(years):
-    year_data = result_df[result_df['year'] == year]
+# result_df is already grouped by year, so iterate the groups rather than re-filtering
+for i, (year, year_data) in enumerate(result_df.groupby('year', sort=True)):
     plt.plot(
         year_data['aligned_date'],
         year_data['proportion_infected'],
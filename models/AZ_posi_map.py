@@ -1,8 +1,9 @@
 import geopandas as gpd
 import pandas as pd
 import matplotlib.pyplot as plt
-import utm
+from matplotlib.lines import Line2D
 import numpy as np
+from pyproj import Transformer
 
 # path to .shp file
 shapefile_path = "AZ_subdvsns\\cb_2022_04_cousub_500k.shp"
@@ -15,75 +16,89 @@ sites_data = pd.read_csv(csv_path)
 
 # colours
 colours = ['#FB0650', '#1E88E5', '#07FF81', '#004D40']
+colour_map = dict(zip([1, 2, 3, 4], colours))
 
 # convert utm to lat long
-latitudes = []
-longitudes = []
-
-for index, row in sites_data.iterrows():
-    try:
-        # check if coordinates are valid
-        if pd.notna(row['m E']) and pd.notna(row['m N']):
-            easting = float(row['m E'])
-            northing = float(row['m N'])
-            zone_number = int(row['UTM Zone'].rstrip('S').rstrip('R'))
-            zone_string = str(row['UTM Zone'])
-            if 'S' in zone_string:
-                zone_letter = 'S'
-            elif 'R' in zone_string:
-                zone_letter = 'R'
-            else:
-                zone_letter = 'N'
-
-            # convert utm t lat long
-            lat, long = utm.to_latlon(easting, northing, zone_number, zone_letter)
-
-            latitudes.append(lat)
-            longitudes.append(long)
-        else:
-            latitudes.append(np.nan)
-            longitudes.append(np.nan)
-    except Exception as e:
-        print(f"Error on row {index}: {e}")
-        latitudes.append(np.nan)
-        longitudes.append(np.nan)
-
-# put lat long into dataframe
-sites_data['Latitude'] = latitudes
-sites_data['Longitude'] = longitudes
+utm_coords = pd.DataFrame({
+    'easting': pd.to_numeric(sites_data['m E'], errors='coerce'),
+    'northing': pd.to_numeric(sites_data['m N'], errors='coerce'),
+})
+utm_coords[['zone_number', 'zone_letter']] = sites_data['UTM Zone'].astype(str).str.extract(r'(\d+)([A-Z]?)')
+utm_coords['zone_number'] = pd.to_numeric(utm_coords['zone_number'], errors='coerce')
+utm_coords['zone_letter'] = utm_coords['zone_letter'].replace('', 'N')
+
+# check if coordinates are valid - same ranges utm.to_latlon accepts
+valid = (
+    utm_coords['easting'].between(100000, 999999)
+    & utm_coords['northing'].between(0, 10000000)
+    & utm_coords['zone_number'].between(1, 60)
+)
+
+sites_data['Latitude'] = np.nan
+sites_data['Longitude'] = np.nan
+
+# convert each utm zone in one batch - latitude bands C to M are south of the equator
+for (zone_number, zone_letter), zone_coords in utm_coords[valid].groupby(['zone_number', 'zone_letter']):
+    south = ' +south' if zone_letter < 'N' else ''
+    transformer = Transformer.from_crs(
+        f"+proj=utm +zone={int(zone_number)}{south} +ellps=WGS84", "EPSG:4326", always_xy=True)
+    longs, lats = transformer.transform(zone_coords['easting'].values, zone_coords['northing'].values)
+
+    # put lat long into dataframe
+    sites_data.loc[zone_coords.index, 'Latitude'] = lats
+    sites_data.loc[zone_coords.index, 'Longitude'] = longs
 
 # filter for positive cases
 positive_sites = sites_data[sites_data['Test Result'] == 1].dropna(
     subset=['Latitude', 'Longitude'])
 
 # create GeoDataFrame using pos cases
-geometry = gpd.points_from_xy(positive_sites['Longitude'], positive_sites['Latitude'])
+lon = positive_sites['Longitude'].to_numpy(np.float64)
+lat = positive_sites['Latitude'].to_numpy(np.float64)
+geometry = gpd.points_from_xy(lon, lat)
 positive_gdf = gpd.GeoDataFrame(positive_sites, geometry = geometry, crs="EPSG:4326")
 
 # load the country subdivisons shapefile
-az_subdivisions = gpd.read_file(shapefile_path)
+az_subdivisions = gpd.read_file(shapefile_path, engine='pyogrio')
 
-# create figure and axis
-fig, ax = plt.subplots(figsize = (12, 10))
+# reproject both layers once to utm zone 12N so plotting works in metres
+az_subdivisions = az_subdivisions.to_crs("EPSG:32612")
+positive_gdf = positive_gdf.to_crs("EPSG:32612")
 
-# plot the county subdivisions
-az_subdivisions.plot(ax=ax, color='lightgrey', edgecolor='black', linewidth=0.5)
+# dissolve the subdivisions once - used for the spatial filter and the background fill
+az_outline = az_subdivisions.dissolve()
 
-# plot positive cases by region
-for region_value, colour in zip([1, 2, 3, 4], colours):
-    # filter for positive cases in this region
-    region_sites = positive_gdf[positive_gdf['Region'] == region_value]
+# keep only positive cases that fall inside the subdivisions, using the spatial index
+inside = positive_gdf.sindex.query(az_outline.geometry.iloc[0], predicate='intersects')
+positive_gdf = positive_gdf.iloc[np.sort(inside)]
 
-    if not region_sites.empty:
-        region_sites.plot(
-            ax = ax,
-            color = colour,
-            markersize = 75, marker = 'o',
-            alpha = 0.7,
-            label = f'Region {region_value}'
-        )
+# create figure and axis
+fig, ax = plt.subplots(figsize = (12, 10))
 
-plt.legend()
+# plot the county subdivisions - one filled background, then the subdivision lines on top
+az_outline.plot(ax=ax, color='lightgrey', edgecolor='none')
+az_subdivisions.boundary.plot(ax=ax, color='black', linewidth=0.5, zorder=1)
+
+# plot positive cases by region - one scatter coloured per point
+region_sites = positive_gdf[positive_gdf['Region'].isin(list(colour_map))]
+ax.scatter(
+    region_sites.geometry.x.values,
+    region_sites.geometry.y.values,
+    c = region_sites['Region'].map(colour_map).values,
+    s = 75, marker = 'o',
+    alpha = 0.7,
+    zorder = 2  # keep markers above the map layers
+)
+
+# create legend entries for the regions that have positive cases
+region_legend = [
+    Line2D([0], [0], marker='o', linestyle='none', color=colour, markersize=9, alpha=0.7,
+           label=f'Region {region_value}')
+    for region_value, colour in colour_map.items()
+    if (region_sites['Region'] == region_value).any()
+]
+
+plt.legend(handles=region_legend)
 
 # set the title
 #plt.title('Figure 1. Positive ATV Cases in Arizona by Region', fontsize=16)
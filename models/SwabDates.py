@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+def parse_collection_dates(dates: pd.Series) -> pd.Series:
+    """Parse swab collection dates into tz-naive datetimes."""
+    # fast ISO 8601 pass first; dates that don't match (e.g. M/D/Y exports)
+    # fall back to format inference instead of silently becoming NaT
+    parsed = pd.to_datetime(dates, format='ISO8601', errors='coerce', utc=True)
+    unparsed = parsed.isna() & dates.notna()
+    if unparsed.any():
+        parsed[unparsed] = pd.to_datetime(dates[unparsed], errors='coerce', utc=True)
+
+    # both passes parse to UTC, so mixed or missing offsets share one tz before it is dropped;
+    # tz-naive columns stay off the much slower tz-aware paths in groupby
+    return parsed.dt.tz_localize(None)
+
+def align_to_2020(dates: pd.Series) -> pd.Series:
+    """Move each date onto the same month, day and time of day in 2020."""
+    # numpy datetime arithmetic on month and day offsets - 2020 is a leap year,
+    # so Feb 29 samples still have a valid aligned date
+    values = dates.to_numpy(dtype='datetime64[ns]')
+    month_start = values.astype('datetime64[M]')
+    months = month_start - values.astype('datetime64[Y]').astype('datetime64[M]')
+    day_start = values.astype('datetime64[D]')
+    days = day_start - month_start.astype('datetime64[D]')
+    aligned = (np.datetime64('2020-01', 'M') + months).astype('datetime64[D]') + days + (values - day_start)
+    return pd.Series(aligned.astype('datetime64[ns]'), index=dates.index)
@@ -29,6 +29,8 @@ os.environ["REQUESTS_CA_BUNDLE"] = certifi.where()
 os.environ["SSL_CERT_FILE"] = certifi.where()
 
 from datetime import date
+from functools import lru_cache
+from joblib import Parallel, delayed
 from epymorph.kit import *
 from epymorph.adrio import acs5, us_tiger, prism as prism_adrio
 
@@ -333,37 +335,43 @@ class SeasonalMaturation(ParamFunctionTimeAndNode):
 # ---------------
 # Build the RUME
 # ---------------
-rume = SIR_v4().build(
-    scope=scope,
-    time_frame=time,
-    params={
-        # offspring IPM params
-            # class function incorporates seasonality
-        "gpm:offspring::ipm::beta": SeasonalBeta(daily_temps),
-        "gpm:offspring::ipm::death_rate": SeasonalDeaths(),
-        "gpm:offspring::ipm::disease_death_rate": 1 / 365,
-
-        # adult IPM params
-        "gpm:adult::ipm::death_rate": SeasonalDeaths(),
-
-        # meta params
-        "meta::ipm::mature_rate": SeasonalMaturation(),
-        "meta::ipm::birth_rate": SeasonalBirths(),
-        "meta::ipm::p_vert": 0.40,
-        "meta::ipm::p_chronic": 0.5,
-        "meta::ipm::p_disease_death": 0.20,
-
-        # populations per strata
-        "gpm:offspring::init::population": 0,#offspring_pop.tolist(), # potentially do ParamFunctionTxN here so first year is at 0 then other years are dynamic
-        "gpm:adult::mm::population": adult_pop.tolist(),
-        "gpm:adult::init::population": adult_pop.tolist(),
-
-        # adult movement
-        "gpm:adult::mm::commuter_proportion": 0.20,
-    },
-)
+# cached on the scalar params so repeated runs with the same
+# parameters reuse one built RUME instead of rebuilding it
+@lru_cache(maxsize=None)
+def build_rume(p_vert=0.40, p_chronic=0.5, p_disease_death=0.20, commuter_proportion=0.20):
+    return SIR_v4().build(
+        scope=scope,
+        time_frame=time,
+        params={
+            # offspring IPM params
+                # class function incorporates seasonality
+            "gpm:offspring::ipm::beta": SeasonalBeta(daily_temps),
+            "gpm:offspring::ipm::death_rate": SeasonalDeaths(),
+            "gpm:offspring::ipm::disease_death_rate": 1 / 365,
+
+            # adult IPM params
+            "gpm:adult::ipm::death_rate": SeasonalDeaths(),
+
+            # meta params
+            "meta::ipm::mature_rate": SeasonalMaturation(),
+            "meta::ipm::birth_rate": SeasonalBirths(),
+            "meta::ipm::p_vert": p_vert,
+            "meta::ipm::p_chronic": p_chronic,
+            "meta::ipm::p_disease_death": p_disease_death,
+
+            # populations per strata
+            "gpm:offspring::init::population": 0,#offspring_pop.tolist(), # potentially do ParamFunctionTxN here so first year is at 0 then other years are dynamic
+            "gpm:adult::mm::population": adult_pop.tolist(),
+            "gpm:adult::init::population": adult_pop.tolist(),
+
+            # adult movement
+            "gpm:adult::mm::commuter_proportion": commuter_proportion,
+        },
+    )
 
 
+rume = build_rume()
+
 # View the transmission rates over time
 beta_values = (
     SeasonalBeta(daily_temps)
@@ -391,9 +399,23 @@ plt.show()
 # -----------------
 # Run a simulation
 # -----------------
-sim = BasicSimulator(rume)
-with sim_messaging(live=False):
-    out = sim.run(rng_factory=default_rng(5))
+def simulate(rume, seed):
+    sim = BasicSimulator(rume)
+    with sim_messaging(live=False):
+        return sim.run(rng_factory=default_rng(seed))
+
+def run_once(seed, **params):
+    return simulate(build_rume(**params), seed)
+
+# runs for different seeds are independent, so an ensemble is spread across processes
+# the RUME is built (or taken from the cache) once here and shipped to the workers,
+# since the lru_cache wrapper itself can't be pickled into them
+# e.g. outs = run_ensemble(range(100))
+def run_ensemble(seeds, n_jobs=-1, **params):
+    rume = build_rume(**params)
+    return Parallel(n_jobs=n_jobs)(delayed(simulate)(rume, seed) for seed in seeds)
+
+out = run_once(5)
 
 df_out = out.dataframe
 
@@ -431,6 +453,5 @@ print(df_out.groupby("tick")[["S_offspring","I_offspring"]].sum().loc[250:260])
 
 """
 # view columns for diagnostic purposes
-for column in df_out.columns:
-    print(f"\n{column}\n")
+print("\n\n".join(df_out.columns))
 """
\ No newline at end of file
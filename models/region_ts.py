@@ -2,77 +2,59 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.lines import Line2D
+from SwabDates import align_to_2020, parse_collection_dates
 
 # load file
 filepath = "SwabData_SFE_total_copynumb_region.csv"
-region_file = pd.read_csv(filepath)
+region_file = pd.read_csv(
+    filepath,
+    usecols=['collection_date', 'CT', 'type', 'region'],
+    dtype={'type': 'category', 'region': 'Int8'},
+)
 
 # format date + CT
-region_file['collection_date'] = pd.to_datetime(region_file['collection_date'], errors='coerce')
+region_file['collection_date'] = parse_collection_dates(region_file['collection_date'])
 region_file['CT'] = pd.to_numeric(region_file['CT'], errors='coerce')
 
-# filter for swab samples only
-region_file = region_file[region_file['type'] == "S"].copy()
+# filter for swab samples only and sort once by date - undated rows can't be placed in a year
+region_file = region_file[region_file['type'] == "S"].dropna(subset=['collection_date']).sort_values('collection_date')
 
 # tag positives
 region_file['is_positive'] = region_file['CT'] > 0
 
 # extract year
-region_file['year'] = region_file['collection_date'].dt.year
+region_file['year'] = region_file['collection_date'].dt.year.astype('int16')
 
 # get total number of tests per year
-total_2019 = len(region_file[region_file['year'] == 2019])
-total_2020 = len(region_file[region_file['year'] == 2020])
+totals = region_file['year'].value_counts()
+total_2019 = totals.get(2019, 0)
+total_2020 = totals.get(2020, 0)
 total_tests = {2019: total_2019, 2020: total_2020}
 
 print(total_2019)
 
 # align dates
-region_file['aligned_date'] = region_file['collection_date'].apply(lambda d: d.replace(year=2020))
+region_file['aligned_date'] = align_to_2020(region_file['collection_date'])
 
 # remove 2021
 region_file = region_file[region_file['year'] != 2021]
 
-# store results
-results = []
+# count positives per region and date, then run a cumulative sum within each region-year
+regions = region_file[region_file['region'].isin(range(1, 5))]
+daily = regions.groupby(['region', 'year', 'collection_date'])['is_positive'].sum().sort_index()
+cumulative_pos = daily.groupby(level=['region', 'year']).cumsum()
 
-# loop through regions
-for region in range(1, 5):
-    region_df = region_file[region_file['region'] == region].copy()
-
-    # loop through years
-    for year in sorted(region_df['year'].unique()):
-        year_data = region_df[region_df['year'] == year].copy()
-
-        # set total based on year
-        year_total = total_tests[year]
-
-        # set running total
-        cumulative_pos = 0
-
-        # loop through dates
-        for date in sorted(year_data['collection_date'].unique()):
-            date_data = year_data[year_data['collection_date'] == date]
-
-            # update total
-            cumulative_pos += date_data['is_positive'].sum()
-
-            # get prop
-            proportion = cumulative_pos / year_total if year_total > 0 else 0
-
-            # store data
-            results.append({
-                'region': region,
-                'year': year,
-                'date': date,
-                'aligned_date': pd.to_datetime(date).replace(year=2020),
-                'cumulative_total': year_total,
-                'cumulative_positive': cumulative_pos,
-                'proportion_infected': proportion
-            })
+# set total based on year
+year_total = daily.index.get_level_values('year').map(total_tests)
 
 # to dataframe
-result_df = pd.DataFrame(results)
+result_df = cumulative_pos.reset_index().rename(
+    columns={'collection_date': 'date', 'is_positive': 'cumulative_positive'})
+result_df['cumulative_total'] = year_total.values
+result_df['proportion_infected'] = cumulative_pos.values / year_total.values
+
+# align result dates to the same reference year (2020)
+result_df['aligned_date'] = align_to_2020(result_df['date'])
 
 # plot
 plt.figure(figsize=(14, 7))
@@ -92,17 +74,15 @@ year_styles = {
 }
 
 # plot all
-for region in sorted(result_df['region'].unique()):
-    for year in sorted(result_df[result_df['region'] == region]['year'].unique()):
-        plot_data = result_df[(result_df['region'] == region) & (result_df['year'] == year)]
-        plt.plot(
-            plot_data['aligned_date'],
-            plot_data['proportion_infected'],
-            label=f'Region {region}, {year}',
-            color=region_colors[region],
-            linestyle=year_styles.get(year, 'solid'),  # fallback if year not mapped
-            linewidth=2
-        )
+for (region, year), plot_data in result_df.groupby(['region', 'year'], sort=True):
+    plt.plot(
+        plot_data['aligned_date'],
+        plot_data['proportion_infected'],
+        label=f'Region {region}, {year}',
+        color=region_colors[region],
+        linestyle=year_styles.get(year, 'solid'),  # fallback if year not mapped
+        linewidth=2
+    )
 
 # format plot
 #plt.title('Figure 4. Cumulative Proportion Infected by Year and Region')